@@ -1,8 +1,9 @@
 import os
-from sqlalchemy import create_engine, Column, String, Float, Integer, DECIMAL, DateTime, BigInteger
+from sqlalchemy import create_engine, Column, String, Float, Integer, DECIMAL, DateTime, BigInteger, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, expression
+from sqlalchemy.ext.compiler import compiles
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,23 @@ engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+class utcnow(expression.FunctionElement):
+    """
+    Timestamp actual de la base. En SQLite se guarda con microsegundos, igual que los
+    datetime que escribe SQLAlchemy; CURRENT_TIMESTAMP ('YYYY-MM-DD HH:MM:SS') no se
+    compara bien como texto contra parámetros con '.ffffff' (ej. cursores de /sync)
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
 # Modelos
 class FinancialData(Base):
     __tablename__ = "financial_data"
@@ -31,8 +49,37 @@ class FinancialData(Base):
     tipo = Column(String(50), index=True, nullable=False)  # 'uva', 'dolar_mayorista', 'dolar_mep'
     fecha = Column(String(20), index=True, nullable=False)
     valor = Column(DECIMAL(10, 2), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
+
+    __table_args__ = (
+        # Delta sync: filas modificadas después de un cursor, por tipo o para todos
+        Index('idx_financial_data_tipo_updated_at', 'tipo', 'updated_at', 'id'),
+        Index('idx_financial_data_updated_at', 'updated_at', 'id'),
+    )
+
+class JobLease(Base):
+    """Lease por job: garantiza que un solo worker ejecute el job a la vez"""
+    __tablename__ = "job_leases"
+
+    name = Column(String(100), primary_key=True)
+    run_id = Column(String(100), nullable=False)
+    owner = Column(String(100), nullable=False)  # hostname:pid
+    expires_at = Column(DateTime, nullable=False)  # UTC
+
+class JobRun(Base):
+    """Registro idempotente de cada ejecución, visible para todos los workers"""
+    __tablename__ = "job_runs"
+
+    run_id = Column(String(100), primary_key=True)
+    job_name = Column(String(100), index=True, nullable=False)
+    trigger = Column(String(20), nullable=False)  # 'scheduled', 'manual'
+    status = Column(String(20), nullable=False)  # 'running', 'success', 'partial_success', 'error'
+    owner = Column(String(100), nullable=False)
+    started_at = Column(DateTime, nullable=False)  # UTC
+    finished_at = Column(DateTime)  # UTC
+    result = Column(Text)  # JSON
+    alias_of = Column(String(100))  # run_id cuyo resultado se reutilizó, si no se ejecutó
 
 def init_db():
     """Crea las tablas si no existen"""
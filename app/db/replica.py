@@ -0,0 +1,177 @@
+import os
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker
+from app.db.database import FinancialData, SessionLocal
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ruta del archivo SQLite local; si no está definida el modo réplica queda desactivado
+READ_REPLICA_PATH = os.getenv("READ_REPLICA_PATH")
+READ_REPLICA_SYNC_SECONDS = int(os.getenv("READ_REPLICA_SYNC_SECONDS", "300"))
+
+# Se relee una ventana hacia atrás en cada sync: una transacción que empezó antes
+# puede commitear después con un updated_at menor al último copiado
+SYNC_OVERLAP = timedelta(seconds=60)
+SYNC_BATCH_SIZE = 5000
+
+def _to_utc_naive(value: datetime | None) -> datetime | None:
+    """SQLite no guarda zona horaria: todo se almacena en UTC naive"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+class ReadReplica:
+    """
+    Copia local en SQLite de financial_data para servir lecturas sin ir a Supabase.
+    Se mantiene al día con syncs incrementales por updated_at (timer y después de cada
+    escritura); las escrituras siguen yendo a Postgres. Si Postgres no responde, las
+    lecturas siguen saliendo de la última copia sincronizada.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False}
+        )
+        event.listen(self.engine, "connect", self._configure_connection)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        FinancialData.__table__.create(bind=self.engine, checkfirst=True)
+
+        self._sync_lock = threading.Lock()
+        self._synced_at: float | None = None
+        self._attempted_at: float | None = None
+        # Una copia de una ejecución anterior ya sirve para leer aunque Postgres no
+        # responda al arrancar; queda vencida hasta el primer sync exitoso
+        self._has_data = self._has_rows()
+        if self._has_data:
+            logger.info(f"Read replica at {path} has data from a previous run, serving reads from it")
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL: las lecturas no se bloquean mientras corre un sync
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Lecturas vía mmap en lugar de read() sobre el archivo
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+    @property
+    def ready(self) -> bool:
+        """True si el archivo ya tenía datos o se completó al menos un sync"""
+        return self._has_data or self._synced_at is not None
+
+    @property
+    def stale(self) -> bool:
+        """
+        True si corresponde intentar un sync. Se mide desde el último intento, no el
+        último éxito, para no reintentar en cada lectura mientras Postgres no responde.
+        """
+        return self._attempted_at is None or monotonic() - self._attempted_at > READ_REPLICA_SYNC_SECONDS
+
+    def get_session(self):
+        """Sesión de solo lectura sobre la réplica local"""
+        return self.SessionLocal()
+
+    def _has_rows(self) -> bool:
+        db = self.SessionLocal()
+        try:
+            return db.query(FinancialData.id).first() is not None
+        finally:
+            db.close()
+
+    def _last_updated_at(self) -> datetime | None:
+        db = self.SessionLocal()
+        try:
+            record = db.query(FinancialData.updated_at).order_by(
+                FinancialData.updated_at.desc()
+            ).first()
+            return record.updated_at if record else None
+        finally:
+            db.close()
+
+    def _apply(self, rows):
+        table = FinancialData.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={column: stmt.excluded[column] for column in ('tipo', 'fecha', 'valor', 'created_at', 'updated_at')}
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+
+    def sync(self) -> int:
+        """Copia las filas nuevas o modificadas desde Postgres. Retorna cuántas se aplicaron."""
+        with self._sync_lock:
+            return self._sync()
+
+    def _sync(self) -> int:
+        self._attempted_at = monotonic()
+        last_updated_at = self._last_updated_at()
+        since = None
+        if last_updated_at is not None:
+            since = (last_updated_at - SYNC_OVERLAP).replace(tzinfo=timezone.utc)
+
+        total = 0
+        last_id = 0
+        db = SessionLocal()
+        try:
+            while True:
+                query = db.query(FinancialData)
+                if since is not None:
+                    query = query.filter(FinancialData.updated_at >= since)
+
+                # Paginación por id dentro de la ventana
+                records = query.filter(FinancialData.id > last_id).order_by(
+                    FinancialData.id.asc()
+                ).limit(SYNC_BATCH_SIZE).all()
+
+                if not records:
+                    break
+
+                self._apply([
+                    {
+                        'id': record.id,
+                        'tipo': record.tipo,
+                        'fecha': record.fecha,
+                        'valor': record.valor,
+                        'created_at': _to_utc_naive(record.created_at),
+                        'updated_at': _to_utc_naive(record.updated_at)
+                    }
+                    for record in records
+                ])
+                total += len(records)
+                last_id = records[-1].id
+
+                if len(records) < SYNC_BATCH_SIZE:
+                    break
+        finally:
+            db.close()
+
+        self._synced_at = monotonic()
+        logger.info(f"Read replica synced: {total} records applied to {self.path}")
+        return total
+
+    def request_sync(self):
+        """Dispara un sync en background; si ya hay uno en curso, no hace nada"""
+        if not self._sync_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._sync()
+            except Exception as e:
+                logger.error(f"Read replica sync failed, serving last synced copy: {e}")
+            finally:
+                self._sync_lock.release()
+
+        threading.Thread(target=run, name="read-replica-sync", daemon=True).start()
+
+read_replica = ReadReplica(READ_REPLICA_PATH) if READ_REPLICA_PATH else None
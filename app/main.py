@@ -26,9 +26,18 @@ async def startup_event():
         logger.info("Starting scheduler...")
         start_scheduler()
         logger.info("Scheduler started successfully")
+
+        # /stream: cada worker sigue los cambios de la base para sus propios clientes
+        from app.services.change_feed import change_feed
+        change_feed.start()
     else:
         logger.info("Running on Vercel - Scheduler disabled. Use external cron service.")
 
+    from app.db.replica import read_replica
+    if read_replica is not None:
+        logger.info(f"Read replica enabled at {read_replica.path}")
+        read_replica.request_sync()
+
 @app.get("/")
 async def root():
     return {
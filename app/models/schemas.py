@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List
 from datetime import date
 
 class FinancialRecord(BaseModel):
@@ -10,6 +10,17 @@ class FinancialDataResponse(BaseModel):
     data: List[FinancialRecord]
     total_records: int
 
+class SyncRecord(BaseModel):
+    tipo: str
+    fecha: str
+    valor: float
+    updated_at: str
+
+class SyncResponse(BaseModel):
+    data: List[SyncRecord]
+    cursor: str | None
+    has_more: bool
+
 class HealthCheckResponse(BaseModel):
     status: str
     uva_scraping: bool
@@ -32,3 +43,15 @@ class SchedulerStatusResponse(BaseModel):
     timezone: str
     jobs: List[JobInfo]
     total_jobs: int
+
+class JobRunResponse(BaseModel):
+    run_id: str
+    job_name: str
+    trigger: str
+    status: str
+    owner: str
+    started_at: str | None = None
+    finished_at: str | None = None
+    executed: bool
+    alias_of: str | None = None
+    result: Dict[str, Any] | None = None
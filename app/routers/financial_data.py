@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import FinancialDataResponse, FinancialRecord, HealthCheckResponse, SchedulerStatusResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.models.schemas import FinancialDataResponse, FinancialRecord, HealthCheckResponse, SchedulerStatusResponse, JobRunResponse, SyncResponse
 from app.utils.db_handler import DBHandler
 from app.services.scraper import FinancialScraper
-from app.services.scheduler import get_scheduler_status, update_financial_data
+from app.services.scheduler import get_scheduler_status, run_manual_update
+from app.services.job_lock import get_job_run
+from app.services.broadcaster import broadcaster
+from app.services.change_feed import change_feed
 from typing import List
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,8 +16,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 db_handler = DBHandler()
 
+# Comentario SSE periódico para que proxies no corten conexiones ociosas
+STREAM_KEEPALIVE_SECONDS = 15
+
 @router.get("/uva", response_model=List[FinancialRecord])
-async def get_uva_data():
+def get_uva_data():
     """
     Obtiene los datos históricos de UVA más 10 años de proyecciones mockeadas
     """
@@ -30,7 +38,7 @@ async def get_uva_data():
         raise HTTPException(status_code=500, detail=f"Error retrieving UVA data: {str(e)}")
 
 @router.get("/dolar-mayorista", response_model=List[FinancialRecord])
-async def get_dolar_mayorista_data():
+def get_dolar_mayorista_data():
     """
     Obtiene los datos históricos de Dólar Mayorista más 10 años de proyecciones mockeadas
     """
@@ -48,7 +56,7 @@ async def get_dolar_mayorista_data():
         raise HTTPException(status_code=500, detail=f"Error retrieving Dólar Mayorista data: {str(e)}")
 
 @router.get("/dolar-mep", response_model=List[FinancialRecord])
-async def get_dolar_mep_data():
+def get_dolar_mep_data():
     """
     Obtiene los datos históricos de Dólar MEP más 10 años de proyecciones mockeadas
     """
@@ -65,6 +73,69 @@ async def get_dolar_mep_data():
         logger.error(f"Error getting Dólar MEP data: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving Dólar MEP data: {str(e)}")
 
+@router.get("/sync", response_model=SyncResponse)
+def sync_changes(
+    since: str | None = None,
+    tipo: str | None = None,
+    limit: int = Query(1000, ge=1, le=5000)
+):
+    """
+    Delta sync: retorna solo las filas insertadas o modificadas después del cursor `since`
+    (sin proyecciones). Guardar el `cursor` de la respuesta y mandarlo en el próximo pedido;
+    si `has_more` es true, pedir de nuevo inmediatamente con el nuevo cursor.
+    """
+    try:
+        data, cursor, has_more = db_handler.get_changes(since, tipo, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting changes since {since}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving changes: {str(e)}")
+
+    return SyncResponse(data=data, cursor=cursor, has_more=has_more)
+
+@router.get("/stream")
+async def stream_updates(request: Request, tipo: List[str] | None = Query(None)):
+    """
+    Stream Server-Sent Events con un evento `update` cada vez que se guarda un valor
+    nuevo o distinto, lo haya escrito cualquier worker. Filtrar con `?tipo=uva&tipo=dolar_mep`
+    (por defecto, todos).
+
+    El `id` de cada evento es el cursor de /sync de esa fila: al reconectar, pedir
+    /sync?since=<último id> para recuperar lo que se perdió.
+
+    Ejemplo de evento:
+    id: MjAyNi0xMC0xOVQxOToxMDowNC4xMjM0NTYrMDA6MDB8MTkzMA==
+    data: {"tipo": "uva", "fecha": "19-10-26", "valor": 1603.52, "updated_at": "2026-10-19T19:10:04.123456+00:00"}
+    """
+    if not change_feed.running:
+        # En Vercel (serverless) no hay change feed: el stream nunca recibiría eventos
+        raise HTTPException(status_code=503, detail="Update stream not available in this deployment, use /sync")
+
+    tipos = set(tipo) if tipo else None
+
+    async def event_stream():
+        subscription = broadcaster.subscribe()
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if tipos is None or event['tipo'] in tipos:
+                    yield event['message']
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """
@@ -139,10 +210,14 @@ async def get_scheduler_info():
         raise HTTPException(status_code=500, detail=f"Error retrieving scheduler status: {str(e)}")
 
 @router.post("/scheduler/run-now")
-async def trigger_update_now():
+def trigger_update_now(run_id: str | None = None):
     """
     Ejecuta manualmente el job de actualización (para testing)
 
+    La ejecución es única en toda la flota: si otro worker ya está actualizando,
+    se espera su resultado en lugar de scrapear de nuevo. Mandar un `run_id`
+    hace idempotentes los reintentos (ej. EasyCron): el mismo run_id no se ejecuta dos veces.
+
     Retorna información detallada sobre:
     - Fecha y hora de ejecución (horario Argentina)
     - Valores actualizados para cada indicador
@@ -150,17 +225,43 @@ async def trigger_update_now():
     """
     try:
         logger.info("Manual trigger of financial data update requested")
-        results = update_financial_data()
+        run = run_manual_update(run_id)
+    except Exception as e:
+        logger.error(f"Error executing manual update: {e}")
+        raise HTTPException(status_code=500, detail=f"Error executing update: {str(e)}")
 
-        # Determinar status general
-        has_errors = len(results["errors"]) > 0
-        status = "partial_success" if has_errors else "success"
+    if run["status"] == "error":
+        raise HTTPException(status_code=500, detail=f"Error executing update: {run['result']['errors']}")
 
+    if run["status"] in ("skipped", "running"):
         return {
-            "status": status,
-            "message": "Financial data update completed",
-            **results
+            "status": "skipped",
+            "message": "Financial data update already running on another worker",
+            "run_id": run["run_id"],
+            "running_run_id": run.get("running_run_id", run["run_id"]),
+            "executed": False
         }
+
+    return {
+        "status": run["status"],
+        "message": "Financial data update completed",
+        "run_id": run["run_id"],
+        "executed": run["executed"],
+        "alias_of": run["alias_of"],
+        **run["result"]
+    }
+
+@router.get("/scheduler/runs/{run_id}", response_model=JobRunResponse)
+def get_run(run_id: str):
+    """
+    Obtiene el resultado registrado de una ejecución (programada o manual) por su run_id
+    """
+    try:
+        run = get_job_run(run_id)
     except Exception as e:
-        logger.error(f"Error executing manual update: {e}")
-        raise HTTPException(status_code=500, detail=f"Error executing update: {str(e)}")
+        logger.error(f"Error getting run {run_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving run: {str(e)}")
+
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    return run
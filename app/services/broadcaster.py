@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """Cola de eventos de un cliente, atada al event loop donde se suscribió"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def _offer(self, event: Dict[str, Any]):
+        # Cliente lento: se descarta el evento más viejo en lugar de bloquear al resto
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+class Broadcaster:
+    """
+    Fan-out en proceso de eventos de actualización hacia los clientes conectados.
+    publish() se puede llamar desde cualquier thread (scheduler, threadpool de FastAPI);
+    el evento se serializa una sola vez y se entrega a cada suscriptor en su event loop.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._max_queue = max_queue
+
+    def subscribe(self) -> Subscription:
+        """Registra un suscriptor; debe llamarse desde el event loop"""
+        subscription = Subscription(asyncio.get_running_loop(), self._max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        logger.info(f"Stream subscriber added ({self.subscriber_count} connected)")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        logger.info(f"Stream subscriber removed ({self.subscriber_count} connected)")
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, tipo: str, payload: Dict[str, Any], event_id: str | None = None):
+        """
+        Envía un evento a todos los suscriptores. event_id tiene que tener sentido para
+        toda la flota (ej. el cursor de /sync), no ser un contador del proceso.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        id_line = f"id: {event_id}\n" if event_id else ""
+        event = {
+            'tipo': tipo,
+            'message': f"{id_line}event: update\ndata: {json.dumps({'tipo': tipo, **payload})}\n\n"
+        }
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # Event loop cerrado: el cliente ya no existe
+                self.unsubscribe(subscription)
+
+        logger.info(f"Published {tipo} update to {len(subscribers)} subscribers")
+
+broadcaster = Broadcaster()
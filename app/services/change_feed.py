@@ -0,0 +1,73 @@
+import os
+import threading
+from app.services.broadcaster import broadcaster
+from app.utils.db_handler import DBHandler
+import logging
+
+logger = logging.getLogger(__name__)
+
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "2"))
+
+class ChangeFeed:
+    """
+    Alimenta al broadcaster de /stream desde la base, no desde el proceso que escribe:
+    como la actualización corre en un solo worker de la flota (lease), cada worker
+    sigue los cambios con el mismo cursor (updated_at, id) de /sync y publica a sus
+    propios suscriptores. Sin suscriptores conectados no consulta la base.
+    """
+
+    def __init__(self, db_handler: DBHandler):
+        self.db_handler = db_handler
+        self._cursor: str | None = None
+        self._following = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="stream-change-feed", daemon=True)
+        self._thread.start()
+        logger.info(f"Change feed started, polling every {STREAM_POLL_SECONDS}s while clients are connected")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(STREAM_POLL_SECONDS):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Change feed poll failed: {e}")
+
+    def poll(self) -> int:
+        """Publica los cambios nuevos desde el último cursor. Retorna cuántos publicó."""
+        if broadcaster.subscriber_count == 0:
+            # Al volver a haber clientes se arranca desde ese momento, sin backlog
+            self._following = False
+            return 0
+
+        if not self._following:
+            self._cursor = self.db_handler.get_current_cursor()
+            self._following = True
+            return 0
+
+        published = 0
+        while True:
+            rows, cursor, has_more = self.db_handler.get_changes(self._cursor)
+            for row in rows:
+                broadcaster.publish(row['tipo'], {
+                    'fecha': row['fecha'],
+                    'valor': row['valor'],
+                    'updated_at': row['updated_at']
+                }, event_id=row['cursor'])
+            published += len(rows)
+            self._cursor = cursor
+            if not has_more:
+                return published
+
+change_feed = ChangeFeed(DBHandler())
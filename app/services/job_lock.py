@@ -0,0 +1,207 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.database import JobLease, JobRun, SessionLocal
+from typing import Any, Callable, Dict
+from datetime import datetime, timedelta, timezone
+from time import sleep
+import json
+import logging
+import os
+import socket
+
+logger = logging.getLogger(__name__)
+
+# Debe superar la duración máxima de un job; si el dueño muere, otro worker lo retoma al vencer
+LEASE_TTL_SECONDS = int(os.getenv("JOB_LEASE_TTL_SECONDS", "900"))
+POLL_INTERVAL_SECONDS = 2
+
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+def _utcnow() -> datetime:
+    """UTC naive, igual en SQLite y Postgres"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def acquire_lease(db: Session, name: str, run_id: str) -> bool:
+    """
+    Intenta tomar el lease del job. Funciona igual en Postgres y en SQLite:
+    el UPDATE condicional retoma leases vencidos y la PK evita dos INSERT simultáneos.
+    """
+    now = _utcnow()
+    expires_at = now + timedelta(seconds=LEASE_TTL_SECONDS)
+
+    taken = db.query(JobLease).filter(
+        JobLease.name == name,
+        JobLease.expires_at < now
+    ).update(
+        {'run_id': run_id, 'owner': OWNER, 'expires_at': expires_at},
+        synchronize_session=False
+    )
+    if taken:
+        db.commit()
+        return True
+
+    try:
+        db.add(JobLease(name=name, run_id=run_id, owner=OWNER, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+def release_lease(db: Session, name: str, run_id: str):
+    """
+    Libera el lease solo si sigue siendo nuestro. Se filtra también por owner porque
+    al retomar un run vencido el nuevo dueño conserva el mismo run_id
+    """
+    db.query(JobLease).filter(
+        JobLease.name == name,
+        JobLease.run_id == run_id,
+        JobLease.owner == OWNER
+    ).delete(synchronize_session=False)
+    db.commit()
+
+def _run_info(run: JobRun, executed: bool) -> Dict[str, Any]:
+    return {
+        'run_id': run.run_id,
+        'job_name': run.job_name,
+        'trigger': run.trigger,
+        'status': run.status,
+        'owner': run.owner,
+        'started_at': run.started_at.isoformat() if run.started_at else None,
+        'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+        'executed': executed,
+        'alias_of': run.alias_of,
+        'result': json.loads(run.result) if run.result else None
+    }
+
+def _record_alias(db: Session, run_id: str, trigger: str, target: JobRun) -> JobRun:
+    """
+    Registra run_id con el resultado de otra ejecución ya terminada, para que los
+    reintentos con el mismo run_id no vuelvan a ejecutar el job
+    """
+    alias = JobRun(
+        run_id=run_id,
+        job_name=target.job_name,
+        trigger=trigger,
+        status=target.status,
+        owner=target.owner,
+        started_at=target.started_at,
+        finished_at=target.finished_at,
+        result=target.result,
+        alias_of=target.alias_of or target.run_id
+    )
+    db.add(alias)
+    try:
+        db.commit()
+        return alias
+    except IntegrityError:
+        # Un reintento concurrente con el mismo run_id ya lo registró
+        db.rollback()
+        return db.get(JobRun, run_id)
+
+def get_job_run(run_id: str) -> Dict[str, Any] | None:
+    """Obtiene el registro de una ejecución por su run_id"""
+    db = SessionLocal()
+    try:
+        run = db.get(JobRun, run_id)
+        return _run_info(run, executed=False) if run else None
+    finally:
+        db.close()
+
+def _wait_for_run(db: Session, run_id: str, wait_seconds: float) -> JobRun | None:
+    """Espera a que otra ejecución termine y devuelve su registro"""
+    deadline = _utcnow() + timedelta(seconds=wait_seconds)
+    while True:
+        db.expire_all()
+        run = db.get(JobRun, run_id)
+        if run is not None and run.status != 'running':
+            return run
+        if _utcnow() >= deadline:
+            return run
+        sleep(POLL_INTERVAL_SECONDS)
+
+def run_exclusive(job_name: str, run_id: str, trigger: str,
+                  fn: Callable[[], Dict[str, Any]], wait_seconds: float = 0) -> Dict[str, Any]:
+    """
+    Ejecuta fn una sola vez en toda la flota para el run_id dado.
+
+    - Si el run_id ya terminó, devuelve el resultado guardado sin volver a ejecutar.
+    - Si otro worker tiene el lease del job, espera hasta wait_seconds a que termine
+      y devuelve el resultado de esa ejecución, registrado también bajo run_id
+      (o status 'skipped' si no terminó).
+    - Si no, toma el lease, registra la ejecución y guarda el resultado en job_runs.
+
+    Si otro worker registró el mismo run_id y no terminó dentro de wait_seconds, se
+    devuelve su registro con status 'running' y result None.
+    """
+    db = SessionLocal()
+    try:
+        existing = db.get(JobRun, run_id)
+        if existing is not None and existing.status != 'running':
+            logger.info(f"Run {run_id} already finished with status {existing.status}")
+            return _run_info(existing, executed=False)
+
+        if not acquire_lease(db, job_name, run_id):
+            holder = db.get(JobLease, job_name)
+            holder_run_id = holder.run_id if holder else None
+            logger.info(f"Job {job_name} is running elsewhere as {holder_run_id}, skipping {run_id}")
+
+            if holder_run_id and wait_seconds > 0:
+                run = _wait_for_run(db, holder_run_id, wait_seconds)
+                if run is not None and run.status != 'running':
+                    return _run_info(_record_alias(db, run_id, trigger, run), executed=False)
+
+            return {
+                'run_id': run_id,
+                'job_name': job_name,
+                'trigger': trigger,
+                'status': 'skipped',
+                'owner': OWNER,
+                'executed': False,
+                'running_run_id': holder_run_id,
+                'result': None
+            }
+
+        try:
+            if existing is not None:
+                # El dueño anterior murió sin terminar y su lease venció: retomamos
+                logger.warning(f"Taking over stale run {run_id} from {existing.owner}")
+                run = existing
+                run.owner = OWNER
+                run.started_at = _utcnow()
+            else:
+                run = JobRun(
+                    run_id=run_id,
+                    job_name=job_name,
+                    trigger=trigger,
+                    status='running',
+                    owner=OWNER,
+                    started_at=_utcnow()
+                )
+                db.add(run)
+            try:
+                db.commit()
+            except IntegrityError:
+                # Otro worker registró este run_id entre nuestra lectura y el lease
+                # (puede seguir corriendo, ej. un dueño anterior cuyo lease venció)
+                db.rollback()
+                other = _wait_for_run(db, run_id, wait_seconds)
+                return _run_info(other, executed=False)
+
+            logger.info(f"Running {job_name} as {run_id} on {OWNER}")
+            try:
+                result = fn()
+                run.status = 'partial_success' if result.get('errors') else 'success'
+            except Exception as e:
+                logger.error(f"Run {run_id} failed: {e}")
+                result = {'errors': [str(e)]}
+                run.status = 'error'
+
+            run.finished_at = _utcnow()
+            run.result = json.dumps(result, default=str)
+            db.commit()
+            return _run_info(run, executed=True)
+        finally:
+            release_lease(db, job_name, run_id)
+    finally:
+        db.close()
@@ -1,21 +1,36 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from app.services.scraper import FinancialScraper
+from app.services.job_lock import run_exclusive
+from app.db.replica import read_replica, READ_REPLICA_SYNC_SECONDS
 from app.utils.db_handler import DBHandler
+from app.utils.single_flight import SingleFlight
 import logging
 import pytz
 from datetime import datetime
+from uuid import uuid4
 
 logger = logging.getLogger(__name__)
 
 scheduler = BackgroundScheduler()
 db_handler = DBHandler()
+_flights = SingleFlight()
+
+UPDATE_JOB_NAME = 'update_financial_data'
+# Tiempo que run-now espera a una actualización ya en curso en otro worker
+MANUAL_RUN_WAIT_SECONDS = 120
 
 def update_financial_data():
     """
-    Tarea programada que actualiza los tres valores financieros en la base de datos
+    Tarea programada que actualiza los tres valores financieros en la base de datos.
+    Si ya hay una actualización en curso, espera y devuelve su resultado en lugar
+    de lanzar otra tanda de scrapes (cada una consume créditos de ScraperAPI).
     Returns: Dict con información de la actualización
     """
+    return _flights.do('update_financial_data', _update_financial_data)
+
+def _update_financial_data():
     logger.info("Starting scheduled financial data update...")
 
     # Obtener fecha y hora de Argentina
@@ -94,6 +109,34 @@ def update_financial_data():
     logger.info("Scheduled financial data update completed")
     return results
 
+def run_scheduled_update():
+    """
+    Job diario: un run_id por fecha de Argentina, así aunque cada worker tenga
+    su propio scheduler la actualización corre una sola vez en toda la flota
+    """
+    argentina_tz = pytz.timezone('America/Argentina/Buenos_Aires')
+    run_id = f"update_daily:{datetime.now(argentina_tz).strftime('%Y-%m-%d')}"
+    return run_exclusive(UPDATE_JOB_NAME, run_id, 'scheduled', update_financial_data)
+
+def run_manual_update(run_id: str | None = None):
+    """
+    Ejecución manual (run-now). Si el cliente manda un run_id, los reintentos con el
+    mismo run_id devuelven el resultado guardado en lugar de volver a scrapear.
+    """
+    if run_id is None:
+        run_id = f"manual:{uuid4().hex}"
+    return run_exclusive(
+        UPDATE_JOB_NAME, run_id, 'manual', update_financial_data,
+        wait_seconds=MANUAL_RUN_WAIT_SECONDS
+    )
+
+def sync_read_replica():
+    """Sync periódico de la réplica local de lectura"""
+    try:
+        read_replica.sync()
+    except Exception as e:
+        logger.error(f"Read replica sync failed, serving last synced copy: {e}")
+
 def start_scheduler():
     """
     Inicia el scheduler con tarea programada para las 16:10 hora de Argentina
@@ -103,13 +146,22 @@ def start_scheduler():
 
     # Programar tarea para las 16:10 (4:10 PM) hora de Argentina
     scheduler.add_job(
-        update_financial_data,
+        run_scheduled_update,
         trigger=CronTrigger(hour=16, minute=10, timezone=argentina_tz),
         id='update_daily',
         name='Update financial data at 4:10 PM Argentina time',
         replace_existing=True
     )
 
+    if read_replica is not None:
+        scheduler.add_job(
+            sync_read_replica,
+            trigger=IntervalTrigger(seconds=READ_REPLICA_SYNC_SECONDS),
+            id='sync_read_replica',
+            name='Sync local read replica',
+            replace_existing=True
+        )
+
     scheduler.start()
     logger.info("Scheduler started with daily job at 4:10 PM Argentina time")
 
@@ -5,7 +5,8 @@ import requests
 from time import sleep
 from fastapi import HTTPException
 from bs4 import BeautifulSoup
-from typing import Dict
+from typing import Callable, Dict, Tuple
+import hashlib
 import logging
 import pytz
 
@@ -13,6 +14,30 @@ logger = logging.getLogger(__name__)
 
 class FinancialScraper:
 
+    # Último payload parseado por fuente: {fuente: (fingerprint, resultado)}
+    _parse_memo: Dict[str, Tuple[str, Dict[str, float]]] = {}
+
+    @staticmethod
+    def fingerprint(*parts: str | bytes) -> str:
+        """Hash SHA-256 de las partes de un payload descargado"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    @staticmethod
+    def parse_if_changed(source: str, fingerprint: str, parse: Callable[[], Dict[str, float]]) -> Dict[str, float]:
+        """Parsea solo si el payload cambió desde el último scrape de esa fuente"""
+        cached = FinancialScraper._parse_memo.get(source)
+        if cached is not None and cached[0] == fingerprint:
+            logger.info(f"{source} payload unchanged, skipping parse")
+            return dict(cached[1])
+
+        result = parse()
+        FinancialScraper._parse_memo[source] = (fingerprint, dict(result))
+        return result
+
     @staticmethod
     def parse_price(price_str: str) -> float:
         """
@@ -68,25 +93,33 @@ class FinancialScraper:
 
         try:
             logger.info("Scraping UVA value...")
-            uva_history_price = requests.get(URL_UVA, timeout=10).json()
+            response = requests.get(URL_UVA, timeout=10)
 
             # Usar zona horaria de Argentina
             argentina_tz = pytz.timezone('America/Argentina/Buenos_Aires')
             now_argentina = datetime.datetime.now(argentina_tz)
             current_date = now_argentina.strftime("%d-%m-%Y")
 
-            uva_of_the_current_day = next(
-                (item for item in uva_history_price if item["fecha"] == current_date),
-                None
-            )
+            def parse() -> Dict[str, float]:
+                uva_history_price = response.json()
 
-            if uva_of_the_current_day:
-                valor = float(uva_of_the_current_day.get('valor', 0))
-                logger.info(f"UVA value scraped successfully for {current_date}: {valor}")
-                return {'valor': valor}
-            else:
-                logger.warning(f"UVA value for current day ({current_date}) not found")
-                return {'valor': 0.0}
+                uva_of_the_current_day = next(
+                    (item for item in uva_history_price if item["fecha"] == current_date),
+                    None
+                )
+
+                if uva_of_the_current_day:
+                    valor = float(uva_of_the_current_day.get('valor', 0))
+                    logger.info(f"UVA value scraped successfully for {current_date}: {valor}")
+                    return {'valor': valor}
+                else:
+                    logger.warning(f"UVA value for current day ({current_date}) not found")
+                    return {'valor': 0.0}
+
+            # El resultado depende también de la fecha buscada, no solo del payload
+            return FinancialScraper.parse_if_changed(
+                'uva', FinancialScraper.fingerprint(response.content, current_date), parse
+            )
 
         except Exception as e:
             logger.error(f"Error scraping UVA: {traceback.format_exc()}")
@@ -111,13 +144,18 @@ class FinancialScraper:
             response = requests.get('https://api.scraperapi.com/', params=payload, timeout=60)
             response.raise_for_status()
 
-            # Parsear HTML
-            soup = BeautifulSoup(response.text, 'lxml')
-            precio_dolar_mayorista = soup.find('div', {'data-test': 'instrument-price-last'}).getText()
-            precio_formatted = FinancialScraper.parse_price(precio_dolar_mayorista)
+            def parse() -> Dict[str, float]:
+                # Parsear HTML
+                soup = BeautifulSoup(response.text, 'lxml')
+                precio_dolar_mayorista = soup.find('div', {'data-test': 'instrument-price-last'}).getText()
+                precio_formatted = FinancialScraper.parse_price(precio_dolar_mayorista)
 
-            logger.info(f"Dólar Mayorista value scraped successfully: {precio_formatted}")
-            return {'valor': precio_formatted}
+                logger.info(f"Dólar Mayorista value scraped successfully: {precio_formatted}")
+                return {'valor': precio_formatted}
+
+            return FinancialScraper.parse_if_changed(
+                'dolar_mayorista', FinancialScraper.fingerprint(response.content), parse
+            )
 
         except Exception as e:
             logger.error(f"Error scraping Dólar Mayorista: {traceback.format_exc()}")
@@ -132,32 +170,38 @@ class FinancialScraper:
         try:
             logger.info("Scraping Dólar MEP value...")
             page_content = FinancialScraper.fetch_webpage("https://www.dolarhoy.com/")
-            soup = BeautifulSoup(page_content, 'lxml')
 
-            # Buscar los dólares en la estructura
-            dollars_html_list = soup.find_all('div', class_='tile is-child', limit=10)
+            def parse() -> Dict[str, float]:
+                soup = BeautifulSoup(page_content, 'lxml')
 
-            # Filtrar solo los elementos que contienen información de dólar
-            dollars_html_list = [d for d in dollars_html_list if d.find('a', class_='titleText')]
+                # Buscar los dólares en la estructura
+                dollars_html_list = soup.find_all('div', class_='tile is-child', limit=10)
 
-            for dolar_html in dollars_html_list:
-                title = dolar_html.find('a', class_='titleText').getText().strip()
+                # Filtrar solo los elementos que contienen información de dólar
+                dollars_html_list = [d for d in dollars_html_list if d.find('a', class_='titleText')]
 
-                # Buscar específicamente "Dólar MEP"
-                if "Dólar MEP" in title or "MEP" in title:
-                    values = dolar_html.find('div', class_='values')
+                for dolar_html in dollars_html_list:
+                    title = dolar_html.find('a', class_='titleText').getText().strip()
 
-                    # Intentar obtener precio de venta
-                    venta_elem = values.find('div', class_='venta')
-                    venta_val = venta_elem.find('div', class_='val') if venta_elem else None
+                    # Buscar específicamente "Dólar MEP"
+                    if "Dólar MEP" in title or "MEP" in title:
+                        values = dolar_html.find('div', class_='values')
 
-                    if venta_val:
-                        valor = float(venta_val.get_text().strip().replace('$', '').replace(',', '.'))
-                        logger.info(f"Dólar MEP value scraped successfully: {valor}")
-                        return {'valor': valor}
+                        # Intentar obtener precio de venta
+                        venta_elem = values.find('div', class_='venta')
+                        venta_val = venta_elem.find('div', class_='val') if venta_elem else None
 
-            logger.warning("Dólar MEP not found on page")
-            return {'valor': 0.0}
+                        if venta_val:
+                            valor = float(venta_val.get_text().strip().replace('$', '').replace(',', '.'))
+                            logger.info(f"Dólar MEP value scraped successfully: {valor}")
+                            return {'valor': valor}
+
+                logger.warning("Dólar MEP not found on page")
+                return {'valor': 0.0}
+
+            return FinancialScraper.parse_if_changed(
+                'dolar_mep', FinancialScraper.fingerprint(page_content), parse
+            )
 
         except Exception as e:
             logger.error(f"Error scraping Dólar MEP: {traceback.format_exc()}")
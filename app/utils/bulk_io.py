@@ -0,0 +1,277 @@
+"""
+Importación y exportación masiva de financial_data.
+
+Formato binario (.fdb), little-endian, pensado para leerse con mmap sin parsear:
+    header   16 bytes: magic b'FDAT', versión (uint16), reservado (uint16), cantidad de filas (uint64)
+    fechas   int32 x N: días desde 1970-01-01
+    padding  hasta múltiplo de 8 bytes
+    valores  float64 x N
+"""
+from sqlalchemy import insert
+from app.db.database import FinancialData, SessionLocal
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+from array import array
+import csv
+import mmap
+import os
+import struct
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+TIPOS = ('uva', 'dolar_mayorista', 'dolar_mep')
+FORMATS = ('csv', 'bin')
+
+BINARY_MAGIC = b'FDAT'
+BINARY_VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+EPOCH = date(1970, 1, 1)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+Row = Tuple[str, float]
+
+def parse_fecha(fecha: str) -> int:
+    """'dd-mm-yy' (o 'dd-mm-yyyy') a días desde 1970-01-01"""
+    try:
+        parsed = datetime.strptime(fecha, "%d-%m-%y")
+    except ValueError:
+        parsed = datetime.strptime(fecha, "%d-%m-%Y")
+    return (parsed.date() - EPOCH).days
+
+def format_fecha(days: int) -> str:
+    """Días desde 1970-01-01 a 'dd-mm-yy', el formato que usa la API"""
+    return (EPOCH + timedelta(days=days)).strftime("%d-%m-%y")
+
+def file_path(directory: str, tipo: str, fmt: str) -> str:
+    extension = 'fdb' if fmt == 'bin' else 'csv'
+    return os.path.join(directory, f"{tipo}.{extension}")
+
+def _values_offset(count: int) -> int:
+    dates_end = HEADER.size + 4 * count
+    return dates_end + (-dates_end % 8)
+
+# --- CSV ---
+
+def iter_csv_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Row]]:
+    """Lee un CSV fecha,valor en bloques sin cargar el archivo completo"""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        fecha_idx, valor_idx = header.index('fecha'), header.index('valor')
+
+        chunk: List[Row] = []
+        for row in reader:
+            if len(row) <= max(fecha_idx, valor_idx) or not row[fecha_idx] or not row[valor_idx]:
+                continue
+            chunk.append((row[fecha_idx], float(row[valor_idx])))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def write_csv(path: str, rows: Iterable[Row]) -> int:
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        # Mismo formato que data/*.csv, que usan \n
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(['fecha', 'valor'])
+        for fecha, valor in rows:
+            writer.writerow([fecha, f"{valor:.2f}"])
+            count += 1
+    return count
+
+# --- Binario ---
+
+def write_binary(path: str, rows: Iterable[Row]) -> int:
+    dates = array('i')
+    values = array('d')
+    for fecha, valor in rows:
+        dates.append(parse_fecha(fecha))
+        values.append(valor)
+
+    if sys.byteorder != 'little':
+        dates.byteswap()
+        values.byteswap()
+
+    count = len(dates)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, count))
+        file.write(dates.tobytes())
+        file.write(b'\0' * (_values_offset(count) - HEADER.size - 4 * count))
+        file.write(values.tobytes())
+    return count
+
+class BinarySeries:
+    """
+    Serie .fdb mapeada en memoria. `dates` y `values` son vistas sobre el archivo
+    (sin copiar); usar como context manager para liberar el mapeo.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        self._mmap = None
+        try:
+            # mmap no admite archivos vacíos (ValueError); header corto da struct.error
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, count = HEADER.unpack_from(self._mmap, 0)
+            if magic != BINARY_MAGIC or version != BINARY_VERSION:
+                raise ValueError("unknown header")
+
+            expected_size = _values_offset(count) + 8 * count
+            if len(self._mmap) < expected_size:
+                raise ValueError(f"truncated, {len(self._mmap)} of {expected_size} bytes for {count} rows")
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Invalid binary series file {path}: {e}")
+
+        self.count = count
+        offset = _values_offset(count)
+        view = memoryview(self._mmap)
+        if sys.byteorder == 'little':
+            self.dates = view[HEADER.size:HEADER.size + 4 * count].cast('i')
+            self.values = view[offset:offset + 8 * count].cast('d')
+        else:
+            self.dates = array('i', view[HEADER.size:HEADER.size + 4 * count])
+            self.values = array('d', view[offset:offset + 8 * count])
+            self.dates.byteswap()
+            self.values.byteswap()
+        view.release()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def rows(self) -> Iterator[Row]:
+        for days, valor in zip(self.dates, self.values):
+            yield format_fecha(days), valor
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Row]]:
+        for start in range(0, self.count, chunk_size):
+            end = min(start + chunk_size, self.count)
+            yield [
+                (format_fecha(self.dates[i]), self.values[i])
+                for i in range(start, end)
+            ]
+
+    def close(self):
+        for name in ('dates', 'values'):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- Base de datos ---
+
+def load_tipo(tipo: str, chunks: Iterable[List[Row]]) -> int:
+    """
+    Inserta las filas de un tipo en bloques (un INSERT multi-fila por bloque),
+    salteando las fechas que ya existen. Retorna cuántas filas se insertaron.
+    """
+    db = SessionLocal()
+    try:
+        existing = {
+            fecha for (fecha,) in db.query(FinancialData.fecha).filter(FinancialData.tipo == tipo)
+        }
+
+        inserted = 0
+        for chunk in chunks:
+            new_rows = []
+            for fecha, valor in chunk:
+                if fecha in existing:
+                    continue
+                existing.add(fecha)
+                new_rows.append({'tipo': tipo, 'fecha': fecha, 'valor': round(valor, 2)})
+
+            if new_rows:
+                db.execute(insert(FinancialData.__table__), new_rows)
+                db.commit()
+                inserted += len(new_rows)
+
+        logger.info(f"Bulk loaded {inserted} records for {tipo}")
+        return inserted
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def _load_file(tipo: str, path: str, fmt: str, chunk_size: int) -> int:
+    if fmt == 'bin':
+        with BinarySeries(path) as series:
+            return load_tipo(tipo, series.chunks(chunk_size))
+    return load_tipo(tipo, iter_csv_chunks(path, chunk_size))
+
+def import_files(directory: str, fmt: str = 'csv', tipos: Iterable[str] = TIPOS,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """Carga un archivo por tipo en paralelo (una conexión por tipo)"""
+    sources = {}
+    for tipo in tipos:
+        path = file_path(directory, tipo, fmt)
+        if os.path.exists(path):
+            sources[tipo] = path
+        else:
+            logger.warning(f"File not found: {path}")
+
+    if not sources:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {
+            tipo: executor.submit(_load_file, tipo, path, fmt, chunk_size)
+            for tipo, path in sources.items()
+        }
+        return {tipo: future.result() for tipo, future in futures.items()}
+
+def iter_db_rows(tipo: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Row]:
+    """Filas de un tipo ordenadas por ID, leídas del servidor en bloques"""
+    db = SessionLocal()
+    try:
+        query = db.query(FinancialData.fecha, FinancialData.valor).filter(
+            FinancialData.tipo == tipo
+        ).order_by(FinancialData.id.asc()).yield_per(chunk_size)
+
+        for fecha, valor in query:
+            yield fecha, float(valor)
+    finally:
+        db.close()
+
+def export_files(directory: str, fmt: str = 'csv', tipos: Iterable[str] = TIPOS) -> Dict[str, int]:
+    """Exporta financial_data a un archivo por tipo"""
+    os.makedirs(directory, exist_ok=True)
+    writer = write_binary if fmt == 'bin' else write_csv
+
+    counts = {}
+    for tipo in tipos:
+        path = file_path(directory, tipo, fmt)
+        counts[tipo] = writer(path, iter_db_rows(tipo))
+        logger.info(f"Exported {counts[tipo]} records for {tipo} to {path}")
+    return counts
+
+def convert_csv_to_binary(src_directory: str, dst_directory: str, tipos: Iterable[str] = TIPOS) -> Dict[str, int]:
+    """Convierte los CSV históricos al formato binario sin pasar por la base"""
+    os.makedirs(dst_directory, exist_ok=True)
+
+    counts = {}
+    for tipo in tipos:
+        src = file_path(src_directory, tipo, 'csv')
+        if not os.path.exists(src):
+            logger.warning(f"File not found: {src}")
+            continue
+        rows = (row for chunk in iter_csv_chunks(src) for row in chunk)
+        counts[tipo] = write_binary(file_path(dst_directory, tipo, 'bin'), rows)
+    return counts
@@ -1,13 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 from app.db.database import FinancialData, SessionLocal
-from typing import List, Dict
+from app.db.replica import read_replica
+from app.utils.single_flight import SingleFlight
+from typing import List, Dict, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import base64
 import logging
+import os
 import pytz
 
 logger = logging.getLogger(__name__)
 
+# Compartido entre instancias: el router y el scheduler usan handlers distintos
+_flights = SingleFlight()
+
+# Delta sync: solo se entregan filas con updated_at más viejo que este margen. updated_at es
+# la hora de inicio de la transacción, así que una transacción que empezó antes puede
+# commitear después de que un cliente avanzó su cursor; el margen cubre esa ventana.
+SYNC_SAFETY_LAG_SECONDS = int(os.getenv("SYNC_SAFETY_LAG_SECONDS", "10"))
+
 class DBHandler:
     """Maneja operaciones de base de datos para datos financieros"""
 
@@ -18,9 +31,27 @@ class DBHandler:
         """Obtiene una sesión de base de datos"""
         return SessionLocal()
 
+    def get_read_session(self):
+        """
+        Sesión para lecturas: la réplica local si está activada y ya sincronizó,
+        si no la base principal
+        """
+        if read_replica is not None:
+            if read_replica.stale:
+                read_replica.request_sync()
+            if read_replica.ready:
+                return read_replica.get_session()
+        return SessionLocal()
+
     def read_data(self, financial_type: str) -> List[Dict[str, str]]:
-        """Lee datos de la base de datos ordenados por ID (más viejo a más nuevo)"""
-        db = self.get_session()
+        """
+        Lee datos de la base de datos ordenados por ID (más viejo a más nuevo).
+        Lecturas concurrentes del mismo tipo comparten una única consulta.
+        """
+        return _flights.do(('read_data', financial_type), self._read_data, financial_type)
+
+    def _read_data(self, financial_type: str) -> List[Dict[str, str]]:
+        db = self.get_read_session()
         try:
             records = db.query(FinancialData).filter(
                 FinancialData.tipo == financial_type
@@ -41,13 +72,20 @@ class DBHandler:
             db.close()
 
     def update_value(self, financial_type: str, new_value: float, date_str: str = None) -> bool:
-        """Actualiza o inserta un valor en la base de datos"""
+        """
+        Actualiza o inserta un valor en la base de datos.
+        Si el valor guardado ya es el mismo no se escribe nada (ni se dispara el trigger
+        de updated_at), así /sync y /stream solo ven cambios reales.
+        """
         if date_str is None:
             # Usar zona horaria de Argentina
             argentina_tz = pytz.timezone('America/Argentina/Buenos_Aires')
             now_argentina = datetime.now(argentina_tz)
             date_str = now_argentina.strftime("%d-%m-%y")
 
+        # Misma precisión y redondeo que la columna DECIMAL(10, 2) en Postgres
+        stored_value = Decimal(str(new_value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
         db = self.get_session()
         try:
             # Buscar registro existente
@@ -59,6 +97,10 @@ class DBHandler:
             ).first()
 
             if existing:
+                if existing.valor == stored_value:
+                    logger.info(f"Value for {financial_type} on {date_str} unchanged ({stored_value}), skipping write")
+                    return True
+
                 # Actualizar
                 existing.valor = new_value
                 logger.info(f"Updated existing record for {financial_type} on {date_str}: {new_value}")
@@ -73,6 +115,9 @@ class DBHandler:
                 logger.info(f"Added new record for {financial_type} on {date_str}: {new_value}")
 
             db.commit()
+
+            if read_replica is not None:
+                read_replica.request_sync()
             return True
 
         except Exception as e:
@@ -84,7 +129,7 @@ class DBHandler:
 
     def get_latest_value(self, financial_type: str) -> Dict[str, str] | None:
         """Obtiene el último valor registrado"""
-        db = self.get_session()
+        db = self.get_read_session()
         try:
             record = db.query(FinancialData).filter(
                 FinancialData.tipo == financial_type
@@ -100,10 +145,105 @@ class DBHandler:
         finally:
             db.close()
 
+    @staticmethod
+    def encode_cursor(updated_at: datetime, record_id: int) -> str:
+        """Cursor opaco para delta sync: posición (updated_at, id) de la última fila entregada"""
+        raw = f"{updated_at.isoformat()}|{record_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decodifica un cursor; lanza ValueError si es inválido"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            updated_at, record_id = raw.rsplit('|', 1)
+            return datetime.fromisoformat(updated_at), int(record_id)
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    def get_changes(self, since: str | None = None, financial_type: str | None = None,
+                    limit: int = 1000) -> Tuple[List[Dict], str | None, bool]:
+        """
+        Filas insertadas o modificadas después del cursor `since`, ordenadas por (updated_at, id).
+        Sin cursor devuelve desde el principio. Retorna (filas, nuevo cursor, hay más).
+
+        La paginación es por keyset sobre los índices (tipo, updated_at, id) y (updated_at, id),
+        así que el costo depende de los cambios pendientes y no del largo del historial.
+        Los cambios aparecen recién SYNC_SAFETY_LAG_SECONDS después de escritos, para que
+        el cursor nunca pase por encima de una transacción todavía sin commitear.
+        """
+        cutoff = datetime.now(pytz.utc) - timedelta(seconds=SYNC_SAFETY_LAG_SECONDS)
+
+        db = self.get_session()
+        try:
+            query = db.query(FinancialData).filter(FinancialData.updated_at <= cutoff)
+            if financial_type is not None:
+                query = query.filter(FinancialData.tipo == financial_type)
+
+            if since is not None:
+                since_updated_at, since_id = self.decode_cursor(since)
+                query = query.filter(or_(
+                    FinancialData.updated_at > since_updated_at,
+                    and_(FinancialData.updated_at == since_updated_at, FinancialData.id > since_id)
+                ))
+
+            # Una fila extra para saber si quedan más páginas
+            records = query.order_by(
+                FinancialData.updated_at.asc(), FinancialData.id.asc()
+            ).limit(limit + 1).all()
+
+            has_more = len(records) > limit
+            records = records[:limit]
+
+            data = [
+                {
+                    'tipo': record.tipo,
+                    'fecha': record.fecha,
+                    'valor': float(record.valor),
+                    'updated_at': record.updated_at.isoformat(),
+                    # Cursor que apunta justo después de esta fila
+                    'cursor': self.encode_cursor(record.updated_at, record.id)
+                }
+                for record in records
+            ]
+
+            cursor = since
+            if records:
+                cursor = self.encode_cursor(records[-1].updated_at, records[-1].id)
+
+            logger.info(f"Read {len(data)} changed records for {financial_type or 'all types'}")
+            return data, cursor, has_more
+
+        finally:
+            db.close()
+
+    def get_current_cursor(self) -> str | None:
+        """Cursor de la última fila que /sync ya entregaría, para seguir cambios desde ahora"""
+        cutoff = datetime.now(pytz.utc) - timedelta(seconds=SYNC_SAFETY_LAG_SECONDS)
+
+        db = self.get_session()
+        try:
+            record = db.query(FinancialData.updated_at, FinancialData.id).filter(
+                FinancialData.updated_at <= cutoff
+            ).order_by(
+                FinancialData.updated_at.desc(), FinancialData.id.desc()
+            ).first()
+
+            return self.encode_cursor(record.updated_at, record.id) if record else None
+        finally:
+            db.close()
+
     def get_data_with_projections(self, financial_type: str, years: int = 10) -> List[Dict[str, str]]:
         """
-        Retorna los datos reales de la DB más proyecciones mockeadas hacia adelante
+        Retorna los datos reales de la DB más proyecciones mockeadas hacia adelante.
+        Pedidos concurrentes idénticos comparten la misma lista (no modificarla).
         """
+        return _flights.do(
+            ('projections', financial_type, years),
+            self._build_projections, financial_type, years
+        )
+
+    def _build_projections(self, financial_type: str, years: int) -> List[Dict[str, str]]:
         # Obtener datos reales
         real_data = self.read_data(financial_type)
 
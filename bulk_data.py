@@ -0,0 +1,53 @@
+"""
+Importación / exportación masiva de datos financieros
+Ejecutar:
+    python bulk_data.py import --format csv --dir data       # CSVs (o .fdb) a la base
+    python bulk_data.py export --format bin --dir backup     # base a archivos
+    python bulk_data.py convert --dir data --out data         # CSVs a binario .fdb
+"""
+import argparse
+import time
+from app.utils.bulk_io import FORMATS, TIPOS, DEFAULT_CHUNK_SIZE, import_files, export_files, convert_csv_to_binary
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export de financial_data")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Carga archivos a la base")
+    import_parser.add_argument("--format", choices=FORMATS, default="csv")
+    import_parser.add_argument("--dir", default="data")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    export_parser = subparsers.add_parser("export", help="Exporta la base a archivos")
+    export_parser.add_argument("--format", choices=FORMATS, default="bin")
+    export_parser.add_argument("--dir", default="export")
+
+    convert_parser = subparsers.add_parser("convert", help="Convierte CSVs a binario .fdb")
+    convert_parser.add_argument("--dir", default="data")
+    convert_parser.add_argument("--out", default="data")
+
+    for sub in (import_parser, export_parser, convert_parser):
+        sub.add_argument("--tipo", action="append", choices=TIPOS, help="Repetible; por defecto todos")
+
+    args = parser.parse_args()
+    tipos = args.tipo or TIPOS
+    start = time.perf_counter()
+
+    if args.command == "import":
+        from app.db.database import init_db
+        init_db()
+        counts = import_files(args.dir, args.format, tipos, args.chunk_size)
+        action = "Inserted"
+    elif args.command == "export":
+        counts = export_files(args.dir, args.format, tipos)
+        action = "Exported"
+    else:
+        counts = convert_csv_to_binary(args.dir, args.out, tipos)
+        action = "Converted"
+
+    for tipo, count in counts.items():
+        print(f"  ✅ {action} {count} records for {tipo}")
+    print(f"\n🎉 Done in {time.perf_counter() - start:.2f}s. Total records: {sum(counts.values())}")
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,9 @@ CREATE TABLE IF NOT EXISTS financial_data (
 CREATE INDEX IF NOT EXISTS idx_financial_data_tipo ON financial_data(tipo);
 CREATE INDEX IF NOT EXISTS idx_financial_data_fecha ON financial_data(fecha);
 CREATE INDEX IF NOT EXISTS idx_financial_data_tipo_fecha ON financial_data(tipo, fecha);
+-- Delta sync (GET /sync): filas modificadas después de un cursor (updated_at, id)
+CREATE INDEX IF NOT EXISTS idx_financial_data_tipo_updated_at ON financial_data(tipo, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_financial_data_updated_at ON financial_data(updated_at, id);
 
 -- Función para actualizar updated_at automáticamente
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -27,8 +30,34 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_financial_data_updated_at BEFORE UPDATE ON financial_data
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Lease por job: evita que varios workers/réplicas ejecuten el mismo job a la vez
+CREATE TABLE IF NOT EXISTS job_leases (
+    name VARCHAR(100) PRIMARY KEY,
+    run_id VARCHAR(100) NOT NULL,
+    owner VARCHAR(100) NOT NULL,
+    expires_at TIMESTAMP NOT NULL  -- UTC
+);
+
+-- Registro idempotente de ejecuciones (scheduled y run-now)
+CREATE TABLE IF NOT EXISTS job_runs (
+    run_id VARCHAR(100) PRIMARY KEY,
+    job_name VARCHAR(100) NOT NULL,
+    trigger VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    owner VARCHAR(100) NOT NULL,
+    started_at TIMESTAMP NOT NULL,  -- UTC
+    finished_at TIMESTAMP,  -- UTC
+    result TEXT,
+    alias_of VARCHAR(100)  -- run_id cuyo resultado se reutilizó, si no se ejecutó
+);
+
+ALTER TABLE job_runs ADD COLUMN IF NOT EXISTS alias_of VARCHAR(100);
+
+CREATE INDEX IF NOT EXISTS idx_job_runs_job_name ON job_runs(job_name);
+
 -- Comentarios
 COMMENT ON TABLE financial_data IS 'Almacena datos históricos de valores financieros (UVA, Dólar Mayorista, Dólar MEP)';
 COMMENT ON COLUMN financial_data.tipo IS 'Tipo de valor financiero: uva, dolar_mayorista, dolar_mep';
 COMMENT ON COLUMN financial_data.fecha IS 'Fecha en formato dd-mm-yy';
 COMMENT ON COLUMN financial_data.valor IS 'Valor del indicador financiero';
+COMMENT ON TABLE job_runs IS 'Ejecuciones de jobs; run_id único garantiza una sola ejecución en toda la flota';